@@ -1,4 +1,5 @@
 import Algorithmia
+import functools
 import json
 import pickle
 import random
@@ -10,13 +11,32 @@ import matplotlib.patches as mpatches
 
 emot_list= list()
 
+# One client for all snapshots so the API connection is reused
+client = Algorithmia.client('api-key')
+algo = client.algo('deeplearning/EmotionRecognitionCNNMBP/1.0.1')
+
+# Color code emotions
+emotion_color_dict = {'Neutral':11 , 'Sad':31 , 'Disgust':51 , 'Fear':61 , 'Surprise':41, 'Happy':21, 'Angry':1}
+# Song id ranges of each mood cluster
+songlist = {1: [1,170], 2:[171,334], 3:[335,549], 4:[550, 740], 5:[741,903]}
+# [cluster, number of songs] to pick for each emotion
+cluster_dict = {'Anger': [[5, 2], [3, 7], [2, 12]],
+                'Fear': [[5, 2], [3, 7], [2, 12]],
+                'Sad': [[3, 4], [4, 4], [2, 13]],
+                'Neutral': [[3, 2], [4, 5], [2, 7], [1, 5]],
+                'Disgust': [[3, 2], [4, 5], [2, 7], [1, 5]],
+                'Surprise': [[3, 2], [4, 5], [2, 7], [1, 5]]}
+default_cluster_def = [[2, 10], [4, 5], [1, 6]]
+
+@functools.lru_cache(maxsize=1)
+def recognize(image):
+    # API call, skipped when the snapshot bytes match the previous one
+    return (algo.pipe(bytearray(image)).result)["results"]
+
 def get_emotion():
     print("Getting emotion...")
-    # API call
-    input = bytearray(open("snapshots/pic.png", "rb").read())
-    client = Algorithmia.client('api-key')
-    algo = client.algo('deeplearning/EmotionRecognitionCNNMBP/1.0.1')
-    op = (algo.pipe(input).result)["results"]
+    with open("snapshots/pic.png", "rb") as fp:
+        op = recognize(fp.read())
 
     # Returned from API call
     
@@ -30,28 +50,23 @@ def get_emotion():
             analyze[str(emo["label"])] = float(emo["confidence"])
         current = max(analyze, key=analyze.get)
 
-	# Color code emotions
-        emotion_color_dict = {'Neutral':11 , 'Sad':31 , 'Disgust':51 , 'Fear':61 , 'Surprise':41, 'Happy':21, 'Angry':1}
         emot_list.append(emotion_color_dict[current])
         print(emot_list)
 
     return current
 
+@functools.lru_cache(maxsize=None)
+def get_songnames():
+    # Song names never change while the app runs, load them once
+    with open("test.txt", "rb") as fp:
+        return pickle.load(fp, encoding='latin1')
+
 def get_playlist():
     current = get_emotion()
     #get playlist from emotion
 
-    with open("test.txt", "rb") as fp:
-        songnames = pickle.load(fp, encoding='latin1')
-    songlist = {1: [1,170], 2:[171,334], 3:[335,549], 4:[550, 740], 5:[741,903]}
-    if ((current == "Anger") | (current == "Fear")):
-        cluster_def = [[5, 2], [3, 7], [2, 12]]
-    elif(current == "Sad"):
-        cluster_def = [[3, 4], [4, 4], [2, 13]]
-    elif((current == "Neutral") | (current == "Disgust") | (current == "Surprise")):
-        cluster_def = [[3, 2], [4, 5], [2, 7], [1, 5]]
-    else:
-        cluster_def = [[2, 10], [4, 5], [1, 6]]
+    songnames = get_songnames()
+    cluster_def = cluster_dict.get(current, default_cluster_def)
     
     playlist = list()
     for sets in cluster_def:
@@ -62,16 +77,10 @@ def get_playlist():
     
 def get_emotion_grid():
     data = np.full((5,10), 81)
-    a = 0
 
-    #color according to emotion
-    for i in range(0,5):
-        for q in range(0,10):
-            if(a == len(emot_list)):
-                break
-            print(i, q, a)
-            data[i,q] = emot_list[a]
-            a = a+1
+    #color according to emotion, filling the grid row by row
+    filled = min(len(emot_list), data.size)
+    data.flat[:filled] = emot_list[:filled]
     cmap = colors.ListedColormap(['red', 'blue', 'yellow', 'green', 'cyan', 'magenta', 'black', 'white'])
     bounds = [0,10,20,30,40,50,60]
     norm = colors.BoundaryNorm(bounds, cmap.N)
@@ -97,3 +106,5 @@ def get_emotion_grid():
     #save image
     plt.savefig("static/graph.jpg")
     plt.show()
+    #free the figure, pyplot keeps every open one alive
+    plt.close(fig)
@@ -11,6 +11,10 @@ import base64
 app = flask.Flask(__name__)
 app.secret_key = "bacon"
 
+# Prefix of the data URL sent by the canvas snapshot
+data_url_prefix = re.compile('^data:image/.+;base64,')
+png_signature = b'\x89PNG\r\n\x1a\n'
+
 @app.route('/')
 def index():
     return flask.render_template("musi.html", songs=[])
@@ -19,9 +23,14 @@ def index():
 def get_image():
     #convert base64 image
     image_b64 = request.values['imageBase64']
-    image_data = re.sub('^data:image/.+;base64,', '', image_b64)
-    image_PIL = Image.open(BytesIO(base64.b64decode(image_data)))
-    image_PIL.save("snapshots/pic.png", mode='RGB')
+    image_data = base64.b64decode(data_url_prefix.sub('', image_b64))
+    if image_data.startswith(png_signature):
+        #canvas snapshots are already PNG, save them as sent
+        with open("snapshots/pic.png", "wb") as fp:
+            fp.write(image_data)
+    else:
+        image_PIL = Image.open(BytesIO(image_data))
+        image_PIL.save("snapshots/pic.png", mode='RGB')
     songs = get_playlist()
     print(songs)
     return flask.render_template("musi.html", songs=songs)